@@ -1,8 +1,11 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
 import uuid
 
+import orjson
+
 app = FastAPI(
     title="Task Manager API",
     description="A simple task management API",
@@ -24,52 +27,97 @@ class Task(TaskBase):
     id: str
     completed: bool = False
 
+# Storage form of a Task: a slotted dataclass is far smaller than a Pydantic
+# model, and Task is only needed as the API schema
+@dataclass
+class TaskRecord:
+    __slots__ = ("title", "description", "id", "completed")
+    title: str
+    description: Optional[str]
+    id: str
+    completed: bool
+
+def encode_task(record: TaskRecord) -> bytes:
+    """Serialize a stored task, leaving out null fields (usually description)"""
+    return orjson.dumps({
+        field: value
+        for field in TaskRecord.__slots__
+        if (value := getattr(record, field)) is not None
+    })
+
 # In-memory storage (replace with database in production)
-tasks_db = {}
+tasks_db: dict[str, TaskRecord] = {}
+# Write-through cache of each task's JSON, refreshed whenever the task changes
+tasks_json: dict[str, bytes] = {}
+# Status indexes so the filter endpoints don't scan every task. Dicts rather
+# than sets so the endpoints return tasks in a stable (insertion) order.
+completed_ids: dict[str, None] = {}
+pending_ids: dict[str, None] = {}
+
+def _json(body: bytes) -> Response:
+    """Wrap already-encoded JSON in a response"""
+    return Response(content=body, media_type="application/json")
+
+def _json_list(chunks: Iterable[bytes]) -> Response:
+    """Join already-encoded JSON items into a JSON array response"""
+    return _json(b"[" + b",".join(chunks) + b"]")
+
+_ROOT_RESPONSE_BYTES = orjson.dumps({"message": "Welcome to Task Manager API", "docs": "/docs"})
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to Task Manager API", "docs": "/docs"}
+    return _json(_ROOT_RESPONSE_BYTES)
 
 @app.get("/tasks", response_model=List[Task])
 async def get_all_tasks():
     """Get all tasks"""
-    return list(tasks_db.values())
+    return _json_list(tasks_json.values())
 
 @app.post("/tasks", response_model=Task)
 async def create_task(task: TaskCreate):
     """Create a new task"""
-    task_id = str(uuid.uuid4())
-    new_task = Task(
-        id=task_id,
+    task_id = uuid.uuid4().hex
+    new_task = TaskRecord(
         title=task.title,
         description=task.description,
+        id=task_id,
         completed=False
     )
     tasks_db[task_id] = new_task
-    return new_task
+    tasks_json[task_id] = encode_task(new_task)
+    pending_ids[task_id] = None
+    return _json(tasks_json[task_id])
 
 @app.get("/tasks/{task_id}", response_model=Task)
 async def get_task(task_id: str):
     """Get a specific task by ID"""
     if task_id not in tasks_db:
         raise HTTPException(status_code=404, detail="Task not found")
-    return tasks_db[task_id]
+    return _json(tasks_json[task_id])
 
-@app.put("/tasks/{task_id}", response_model=Task)
+@app.put("/tasks/{task_id}", responses={200: {"model": Task}})
 async def update_task(task_id: str, task_update: TaskUpdate):
     """Update a specific task"""
     if task_id not in tasks_db:
         raise HTTPException(status_code=404, detail="Task not found")
 
     stored_task = tasks_db[task_id]
-    stored_task.title = task_update.title
-    if task_update.description is not None:
-        stored_task.description = task_update.description
-    if task_update.completed is not None:
-        stored_task.completed = task_update.completed
-
-    return stored_task
+    # Only apply fields the client actually sent
+    changes = task_update.model_dump(exclude_unset=True)
+    completed = changes.pop("completed", None)
+    for field, value in changes.items():
+        setattr(stored_task, field, value)
+    if completed is not None and completed != stored_task.completed:
+        stored_task.completed = completed
+        if stored_task.completed:
+            pending_ids.pop(task_id, None)
+            completed_ids[task_id] = None
+        else:
+            completed_ids.pop(task_id, None)
+            pending_ids[task_id] = None
+
+    tasks_json[task_id] = encode_task(stored_task)
+    return _json(tasks_json[task_id])
 
 @app.delete("/tasks/{task_id}")
 async def delete_task(task_id: str):
@@ -78,18 +126,23 @@ async def delete_task(task_id: str):
         raise HTTPException(status_code=404, detail="Task not found")
 
     del tasks_db[task_id]
+    del tasks_json[task_id]
+    completed_ids.pop(task_id, None)
+    pending_ids.pop(task_id, None)
     return {"message": "Task deleted successfully"}
 
 @app.get("/tasks/status/completed", response_model=List[Task])
 async def get_completed_tasks():
     """Get all completed tasks"""
-    return [task for task in tasks_db.values() if task.completed]
+    return _json_list(tasks_json[i] for i in completed_ids)
 
 @app.get("/tasks/status/pending", response_model=List[Task])
 async def get_pending_tasks():
     """Get all pending tasks"""
-    return [task for task in tasks_db.values() if not task.completed]
+    return _json_list(tasks_json[i] for i in pending_ids)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # uvloop/httptools move the event loop and HTTP parsing into C. Stick to one
+    # worker: tasks_db lives in process memory and isn't shared between workers.
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
\ No newline at end of file
@@ -15,21 +15,18 @@ class Task(BaseModel):
     description: str
     completed: bool
 
-tasks = []
+tasks: dict[UUID, Task] = {}
 
 def get_task_by_id(task_id: UUID) -> Optional[Task]:
-    for task in tasks:
-        if task.id == task_id:
-            return task
-    return None
+    return tasks.get(task_id)
 
 @app.get("/tasks", response_model=List[Task])
 def list_tasks():
-    return tasks
+    return list(tasks.values())
 
 @app.post("/tasks", response_model=Task, status_code=status.HTTP_201_CREATED)
 def create_task(task: Task):
-    tasks.append(task)
+    tasks[task.id] = task
     return task
 
 @app.get("/tasks/{task_id}", response_model=Task)
@@ -51,7 +48,5 @@ def update_task(task_id: UUID, updated_task: Task):
 
 @app.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_task(task_id: UUID):
-    task = get_task_by_id(task_id)
-    if task is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-    tasks.remove(task)
\ No newline at end of file
+    if tasks.pop(task_id, None) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
\ No newline at end of file
@@ -3,16 +3,81 @@
 Robust FastAPI Code Generator with better error handling
 """
 
+import ast
+import asyncio
+import hashlib
+import importlib.util
 import os
+import py_compile
 import subprocess
+import sys
+import tempfile
 from pathlib import Path
-import re
+from typing import Dict, Optional, Tuple, Union
 
 from langchain_ollama import ChatOllama
 from langchain.schema import HumanMessage
 
 
+# Shared across generated projects so each venv reuses downloaded wheels
+PIP_CACHE_DIR = Path.home() / ".cache" / "langraph-pip"
+
+
 class RobustFastAPIGenerator:
+    OUTPUT_ROOT = Path("output")
+
+    REQUIREMENTS_TXT = """fastapi>=0.104.0
+uvicorn>=0.24.0
+pydantic>=2.0.0
+python-multipart>=0.0.6
+orjson>=3.9.0
+uvloop>=0.19.0
+httptools>=0.6.0
+"""
+
+    # Built once; only the project name and requirements vary per project
+    README_TEMPLATE = "\n".join([
+        "# {project_name}",
+        "",
+        "{requirements}",
+        "",
+        "## Features",
+        "",
+        "- Task CRUD operations",
+        "- RESTful API design",
+        "- Automatic API documentation",
+        "- Input validation with Pydantic",
+        "- Error handling",
+        "",
+        "## Setup and Run",
+        "",
+        "```bash",
+        "# Install dependencies",
+        "pip install -r requirements.txt",
+        "",
+        "# Run the server",
+        "uvicorn main:app --reload --host 0.0.0.0 --port 8000",
+        "",
+        "# Run without reload, using uvloop and httptools",
+        "python main.py",
+        "```",
+        "",
+        "## API Documentation",
+        "",
+        "Visit: http://localhost:8000/docs",
+        "",
+        "## Available Endpoints",
+        "",
+        "- `GET /` - Welcome message",
+        "- `GET /tasks` - Get all tasks",
+        "- `POST /tasks` - Create a new task",
+        "- `GET /tasks/{{task_id}}` - Get specific task",
+        "- `PUT /tasks/{{task_id}}` - Update task",
+        "- `DELETE /tasks/{{task_id}}` - Delete task",
+        "- `GET /tasks/status/completed` - Get completed tasks",
+        "- `GET /tasks/status/pending` - Get pending tasks"
+    ])
+
     def __init__(self, model_name: str = "deepseek-r1:latest"):
         print(f"🤖 Initializing with {model_name}")
         self.llm = ChatOllama(
@@ -20,16 +85,36 @@ class RobustFastAPIGenerator:
             base_url="http://localhost:11434",
             temperature=0.1,
         )
+        # blake2b digest of source -> (msg, lineno, offset, text) of its syntax error, None when valid
+        self._syntax_cache: Dict[bytes, Optional[Tuple[str, Optional[int], Optional[int], Optional[str]]]] = {}
+        self._template_pyc = self._compile_template()
         print("✅ Generator ready!")
 
+    def _compile_template(self) -> bytes:
+        """Byte-compile the base template once so projects can ship its .pyc"""
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "main.py"
+            source.write_text(self.create_working_fastapi_app(""), encoding="utf-8")
+            # Hash-based so the .pyc stays valid whatever main.py's mtime ends up being
+            cfile = py_compile.compile(
+                str(source),
+                cfile=str(Path(tmp) / "main.pyc"),
+                doraise=True,
+                invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+            )
+            return Path(cfile).read_bytes()
+
     def create_working_fastapi_app(self, requirements: str) -> str:
         """Create a guaranteed working FastAPI app"""
         # Use a simple template that we know works
-        template = '''from fastapi import FastAPI, HTTPException
+        template = '''from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
 import uuid
 
+import orjson
+
 app = FastAPI(
     title="Task Manager API",
     description="A simple task management API",
@@ -51,52 +136,97 @@ class Task(TaskBase):
     id: str
     completed: bool = False
 
+# Storage form of a Task: a slotted dataclass is far smaller than a Pydantic
+# model, and Task is only needed as the API schema
+@dataclass
+class TaskRecord:
+    __slots__ = ("title", "description", "id", "completed")
+    title: str
+    description: Optional[str]
+    id: str
+    completed: bool
+
+def encode_task(record: TaskRecord) -> bytes:
+    """Serialize a stored task, leaving out null fields (usually description)"""
+    return orjson.dumps({
+        field: value
+        for field in TaskRecord.__slots__
+        if (value := getattr(record, field)) is not None
+    })
+
 # In-memory storage (replace with database in production)
-tasks_db = {}
+tasks_db: dict[str, TaskRecord] = {}
+# Write-through cache of each task's JSON, refreshed whenever the task changes
+tasks_json: dict[str, bytes] = {}
+# Status indexes so the filter endpoints don't scan every task. Dicts rather
+# than sets so the endpoints return tasks in a stable (insertion) order.
+completed_ids: dict[str, None] = {}
+pending_ids: dict[str, None] = {}
+
+def _json(body: bytes) -> Response:
+    """Wrap already-encoded JSON in a response"""
+    return Response(content=body, media_type="application/json")
+
+def _json_list(chunks: Iterable[bytes]) -> Response:
+    """Join already-encoded JSON items into a JSON array response"""
+    return _json(b"[" + b",".join(chunks) + b"]")
+
+_ROOT_RESPONSE_BYTES = orjson.dumps({"message": "Welcome to Task Manager API", "docs": "/docs"})
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to Task Manager API", "docs": "/docs"}
+    return _json(_ROOT_RESPONSE_BYTES)
 
 @app.get("/tasks", response_model=List[Task])
 async def get_all_tasks():
     """Get all tasks"""
-    return list(tasks_db.values())
+    return _json_list(tasks_json.values())
 
 @app.post("/tasks", response_model=Task)
 async def create_task(task: TaskCreate):
     """Create a new task"""
-    task_id = str(uuid.uuid4())
-    new_task = Task(
-        id=task_id,
+    task_id = uuid.uuid4().hex
+    new_task = TaskRecord(
         title=task.title,
         description=task.description,
+        id=task_id,
         completed=False
     )
     tasks_db[task_id] = new_task
-    return new_task
+    tasks_json[task_id] = encode_task(new_task)
+    pending_ids[task_id] = None
+    return _json(tasks_json[task_id])
 
 @app.get("/tasks/{task_id}", response_model=Task)
 async def get_task(task_id: str):
     """Get a specific task by ID"""
     if task_id not in tasks_db:
         raise HTTPException(status_code=404, detail="Task not found")
-    return tasks_db[task_id]
+    return _json(tasks_json[task_id])
 
-@app.put("/tasks/{task_id}", response_model=Task)
+@app.put("/tasks/{task_id}", responses={200: {"model": Task}})
 async def update_task(task_id: str, task_update: TaskUpdate):
     """Update a specific task"""
     if task_id not in tasks_db:
         raise HTTPException(status_code=404, detail="Task not found")
 
     stored_task = tasks_db[task_id]
-    stored_task.title = task_update.title
-    if task_update.description is not None:
-        stored_task.description = task_update.description
-    if task_update.completed is not None:
-        stored_task.completed = task_update.completed
-
-    return stored_task
+    # Only apply fields the client actually sent
+    changes = task_update.model_dump(exclude_unset=True)
+    completed = changes.pop("completed", None)
+    for field, value in changes.items():
+        setattr(stored_task, field, value)
+    if completed is not None and completed != stored_task.completed:
+        stored_task.completed = completed
+        if stored_task.completed:
+            pending_ids.pop(task_id, None)
+            completed_ids[task_id] = None
+        else:
+            completed_ids.pop(task_id, None)
+            pending_ids[task_id] = None
+
+    tasks_json[task_id] = encode_task(stored_task)
+    return _json(tasks_json[task_id])
 
 @app.delete("/tasks/{task_id}")
 async def delete_task(task_id: str):
@@ -105,24 +235,61 @@ async def delete_task(task_id: str):
         raise HTTPException(status_code=404, detail="Task not found")
 
     del tasks_db[task_id]
+    del tasks_json[task_id]
+    completed_ids.pop(task_id, None)
+    pending_ids.pop(task_id, None)
     return {"message": "Task deleted successfully"}
 
 @app.get("/tasks/status/completed", response_model=List[Task])
 async def get_completed_tasks():
     """Get all completed tasks"""
-    return [task for task in tasks_db.values() if task.completed]
+    return _json_list(tasks_json[i] for i in completed_ids)
 
 @app.get("/tasks/status/pending", response_model=List[Task])
 async def get_pending_tasks():
     """Get all pending tasks"""
-    return [task for task in tasks_db.values() if not task.completed]
+    return _json_list(tasks_json[i] for i in pending_ids)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop/httptools move the event loop and HTTP parsing into C. Stick to one
+    # worker: tasks_db lives in process memory and isn't shared between workers.
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
 '''
         return template
 
+    @staticmethod
+    def _strip_think_blocks(text: str) -> str:
+        """Remove <think>...</think> sections using plain substring search"""
+        parts = []
+        pos = 0
+        while True:
+            start = text.find("<think>", pos)
+            if start == -1:
+                break
+            end = text.find("</think>", start + len("<think>"))
+            if end == -1:
+                break
+            parts.append(text[pos:start])
+            pos = end + len("</think>")
+        parts.append(text[pos:])
+        return "".join(parts)
+
+    def _check_syntax(self, code: str, filename: str = "<string>") -> Optional[SyntaxError]:
+        """Parse code once per unique source and return a fresh SyntaxError, if any"""
+        key = hashlib.blake2b(code.encode()).digest()
+        if key not in self._syntax_cache:
+            try:
+                ast.parse(code, filename=filename, mode="exec", feature_version=sys.version_info[:2])
+                self._syntax_cache[key] = None
+            except SyntaxError as e:
+                self._syntax_cache[key] = (e.msg, e.lineno, e.offset, e.text)
+        details = self._syntax_cache[key]
+        if details is None:
+            return None
+        msg, lineno, offset, text = details
+        return SyntaxError(msg, (filename, lineno, offset, text))
+
     def enhance_with_llm(self, base_code: str, requirements: str) -> str:
         """Try to enhance the base code with LLM, but fall back to base if it fails"""
         prompt = f"""Take this working FastAPI code and enhance it based on these requirements: {requirements}
@@ -148,7 +315,7 @@ ENHANCED CODE:"""
             enhanced_code = response.content.strip()
 
             # Remove thinking tags and markdown
-            enhanced_code = re.sub(r'<think>.*?</think>', '', enhanced_code, flags=re.DOTALL)
+            enhanced_code = self._strip_think_blocks(enhanced_code)
             if enhanced_code.startswith("```python"):
                 enhanced_code = enhanced_code[9:]
             elif enhanced_code.startswith("```"):
@@ -159,138 +326,133 @@ ENHANCED CODE:"""
             enhanced_code = enhanced_code.strip()
 
             # Validate the enhanced code
-            try:
-                compile(enhanced_code, '<string>', 'exec')
+            error = self._check_syntax(enhanced_code)
+            if error is None:
                 print("✅ Enhanced code is valid!")
                 return enhanced_code
-            except SyntaxError as e:
-                print(f"⚠️  Enhanced code has syntax error: {e}")
-                print("Using base template instead...")
-                return base_code
+            print(f"⚠️  Enhanced code has syntax error: {error}")
+            print("Using base template instead...")
+            return base_code
 
         except Exception as e:
             print(f"⚠️  Enhancement failed: {e}")
             print("Using base template instead...")
             return base_code
 
-    def create_project(self, requirements: str, project_name: str = "my_fastapi_app") -> str:
+    async def create_project(self, requirements: str, project_name: str = "my_fastapi_app") -> str:
         """Create a complete FastAPI project"""
         print(f"🚀 Creating project: {project_name}")
         print(f"📝 Requirements: {requirements}")
 
         # Create project directory
-        project_path = Path(f"output/{project_name}")
+        project_path = self.OUTPUT_ROOT / project_name
         project_path.mkdir(parents=True, exist_ok=True)
 
         # Start with working base code
         base_code = self.create_working_fastapi_app(requirements)
 
-        # Try to enhance with LLM, but fall back to base if needed
-        final_code = self.enhance_with_llm(base_code, requirements)
-
-        # Write main.py
-        with open(project_path / "main.py", "w") as f:
-            f.write(final_code)
-        print("✅ Created main.py")
-
         # Write requirements.txt
-        requirements_txt = """fastapi>=0.104.0
-uvicorn>=0.24.0
-pydantic>=2.0.0
-python-multipart>=0.0.6
-"""
-        with open(project_path / "requirements.txt", "w") as f:
-            f.write(requirements_txt)
+        await asyncio.to_thread(self._write_files, project_path, {"requirements.txt": self.REQUIREMENTS_TXT})
         print("✅ Created requirements.txt")
 
-        # Write README.md - FIXED VERSION
-        readme_parts = [
-            f"# {project_name}",
-            "",
-            requirements,
-            "",
-            "## Features",
-            "",
-            "- Task CRUD operations",
-            "- RESTful API design",
-            "- Automatic API documentation",
-            "- Input validation with Pydantic",
-            "- Error handling",
-            "",
-            "## Setup and Run",
-            "",
-            "```bash",
-            "# Install dependencies",
-            "pip install -r requirements.txt",
-            "",
-            "# Run the server",
-            "uvicorn main:app --reload --host 0.0.0.0 --port 8000",
-            "```",
-            "",
-            "## API Documentation",
-            "",
-            "Visit: http://localhost:8000/docs",
-            "",
-            "## Available Endpoints",
-            "",
-            "- `GET /` - Welcome message",
-            "- `GET /tasks` - Get all tasks",
-            "- `POST /tasks` - Create a new task",
-            "- `GET /tasks/{task_id}` - Get specific task",
-            "- `PUT /tasks/{task_id}` - Update task",
-            "- `DELETE /tasks/{task_id}` - Delete task",
-            "- `GET /tasks/status/completed` - Get completed tasks",
-            "- `GET /tasks/status/pending` - Get pending tasks"
-        ]
-        readme_content = "\n".join(readme_parts)
-
-        with open(project_path / "README.md", "w") as f:
-            f.write(readme_content)
+        # The venv only needs requirements.txt, so build it while the LLM runs
+        env_setup = asyncio.create_task(self.setup_environment(project_path))
+
+        # Try to enhance with LLM, but fall back to base if needed
+        final_code = await asyncio.to_thread(self.enhance_with_llm, base_code, requirements)
+
+        # Write main.py and README.md
+        readme_content = self.README_TEMPLATE.format(project_name=project_name, requirements=requirements)
+        files: Dict[str, Union[str, bytes]] = {
+            "main.py": final_code,
+            "README.md": readme_content,
+        }
+        # Unchanged template: ship its bytecode so the import test skips parsing
+        if final_code == base_code:
+            files[importlib.util.cache_from_source("main.py")] = self._template_pyc
+        await asyncio.to_thread(self._write_files, project_path, files)
+        print("✅ Created main.py")
         print("✅ Created README.md")
 
         # Test the generated code
-        self.test_project(project_path)
+        await self.test_project(project_path, env_setup)
 
         return str(project_path)
 
-    def test_project(self, project_path: Path):
+    @staticmethod
+    def _write_files(project_path: Path, files: Dict[str, Union[str, bytes]]):
+        """Write several project files in one call (run off the event loop)"""
+        for name, content in files.items():
+            path = project_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content, encoding="utf-8")
+
+    async def _run(self, *cmd: str, cwd: Path, env: Optional[Dict[str, str]] = None):
+        """Run a command without blocking the event loop, raising on failure"""
+        # stdout is never read, so don't buffer it; keep stderr for error reports
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, cwd=cwd, env=env, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await proc.communicate()
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+
+    async def setup_environment(self, project_path: Path):
+        """Create the project venv and install requirements.txt into it"""
+        venv_path = project_path / "venv"
+        # Same interpreter that compiled the template, so its cached .pyc matches the venv
+        await self._run(sys.executable, "-m", "venv", str(venv_path), cwd=project_path)
+
+        pip_path = venv_path / "bin" / "pip"
+        pip_env = {**os.environ, "PIP_CACHE_DIR": str(PIP_CACHE_DIR)}
+        await self._run(
+            str(pip_path), "install", "-r", "requirements.txt",
+            "--prefer-binary", "--no-compile", "--disable-pip-version-check",
+            cwd=project_path, env=pip_env,
+        )
+
+    async def test_project(self, project_path: Path, env_setup: Optional["asyncio.Task[None]"] = None):
         """Test if the generated code works"""
         print("🧪 Testing generated code...")
 
+        if env_setup is None:
+            env_setup = asyncio.create_task(self.setup_environment(project_path))
+
         try:
             # Test Python syntax
             with open(project_path / "main.py", "r") as f:
                 code = f.read()
 
-            # Try to compile the code
-            compile(code, str(project_path / "main.py"), 'exec')
+            # Try to parse the code (cached if enhance_with_llm already checked it)
+            error = self._check_syntax(code, str(project_path / "main.py"))
+            if error is not None:
+                raise error
             print("✅ Python syntax is valid!")
 
-            # Try to create virtual environment and test imports
-            venv_path = project_path / "venv"
-            subprocess.run([
-                "python3", "-m", "venv", str(venv_path)
-            ], check=True, cwd=project_path, capture_output=True)
-
-            pip_path = venv_path / "bin" / "pip"
-            subprocess.run([
-                str(pip_path), "install", "-r", "requirements.txt"
-            ], check=True, cwd=project_path, capture_output=True)
+            # Wait for the virtual environment and test imports
+            await env_setup
 
-            python_path = venv_path / "bin" / "python"
-            result = subprocess.run([
-                str(python_path), "-c", "import main; print('✅ Import successful')"
-            ], capture_output=True, text=True, cwd=project_path)
-
-            if result.returncode == 0:
+            python_path = project_path / "venv" / "bin" / "python"
+            try:
+                await self._run(str(python_path), "-c", "import main", cwd=project_path)
                 print("✅ Code imports successfully!")
-            else:
-                print(f"⚠️  Import test failed: {result.stderr}")
+            except subprocess.CalledProcessError as e:
+                print(f"⚠️  Import test failed: {e.stderr.decode(errors='replace')}")
 
         except SyntaxError as e:
             print(f"❌ Syntax error: {e}")
         except Exception as e:
             print(f"⚠️  Test error: {e}")
+        finally:
+            # Don't leave venv/pip running if we bailed out early
+            env_setup.cancel()
 
 
 def main():
@@ -304,7 +466,7 @@ def main():
     - RESTful design with proper HTTP methods
     """
 
-    project_path = generator.create_project(requirements, "robust_task_manager")
+    project_path = asyncio.run(generator.create_project(requirements, "robust_task_manager"))
     print(f"\n🎉 Project created at: {project_path}")
     print(f"\n🏃 To run:")
     print(f"cd {project_path}")